@@ -1,7 +1,9 @@
 import sqlite3
-import json
+import orjson
+import queue
+import threading
+import time
 from pathlib import Path
-from datetime import datetime, timedelta
 from contextlib import contextmanager
 import os
 
@@ -10,30 +12,353 @@ DATA_DIR = Path(__file__).parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 DB_PATH = DATA_DIR / "metrics.db"
 
+# Applied on every new connection. WAL lets the collector write while the
+# history endpoints read, and synchronous=NORMAL drops the fsync per commit
+# (WAL is still durable across application crashes, just not power loss).
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",  # 64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+)
+
+READ_POOL_SIZE = 4
+
+# Typed tables for the fixed-shape system metrics, one column per field.
+# Columns are dotted paths into the collector payload ("swap.total" is stored
+# as swap_total) and nested groups whose columns are all NULL read back as
+# None. PERCENT columns are stored as INTEGER tenths of a percent (42.3 -> 423)
+# since the collectors only report one decimal place, and JSON columns hold
+# small lists that have no fixed width. Temperature readings differ per
+# board, so they stay as JSON in the generic metrics table.
+METRIC_TABLES = {
+    'cpu': (
+        ('percent', 'PERCENT'),
+        ('per_cpu', 'JSON'),
+        ('count', 'INTEGER'),
+        ('frequency.current', 'REAL'),
+        ('frequency.min', 'REAL'),
+        ('frequency.max', 'REAL'),
+    ),
+    'memory': (
+        ('total', 'INTEGER'),
+        ('available', 'INTEGER'),
+        ('used', 'INTEGER'),
+        ('percent', 'PERCENT'),
+        ('swap.total', 'INTEGER'),
+        ('swap.used', 'INTEGER'),
+        ('swap.percent', 'PERCENT'),
+    ),
+    'disk': (
+        ('total', 'INTEGER'),
+        ('used', 'INTEGER'),
+        ('free', 'INTEGER'),
+        ('percent', 'PERCENT'),
+        ('io.read_bytes', 'INTEGER'),
+        ('io.write_bytes', 'INTEGER'),
+        ('io.read_count', 'INTEGER'),
+        ('io.write_count', 'INTEGER'),
+        ('io.read_bytes_per_sec', 'INTEGER'),
+        ('io.write_bytes_per_sec', 'INTEGER'),
+    ),
+    'network': (
+        ('bytes_sent', 'INTEGER'),
+        ('bytes_recv', 'INTEGER'),
+        ('packets_sent', 'INTEGER'),
+        ('packets_recv', 'INTEGER'),
+        ('errin', 'INTEGER'),
+        ('errout', 'INTEGER'),
+        ('dropin', 'INTEGER'),
+        ('dropout', 'INTEGER'),
+        ('bytes_sent_per_sec', 'INTEGER'),
+        ('bytes_recv_per_sec', 'INTEGER'),
+    ),
+}
+
+def _table_name(metric_type: str) -> str:
+    return f"{metric_type}_metrics"
+
+def _column_name(path: str) -> str:
+    return path.replace('.', '_')
+
+def _declared_type(column_type: str) -> str:
+    return {'JSON': 'TEXT', 'PERCENT': 'INTEGER'}.get(column_type, column_type)
+
+_TYPED_COLUMNS = {
+    metric_type: ", ".join(_column_name(path) for path, _ in columns)
+    for metric_type, columns in METRIC_TABLES.items()
+}
+_TYPED_INSERT_SQL = {
+    metric_type: (
+        f"INSERT OR REPLACE INTO {_table_name(metric_type)} (timestamp, {_TYPED_COLUMNS[metric_type]}) "
+        f"VALUES ({', '.join('?' * (len(columns) + 1))})"
+    )
+    for metric_type, columns in METRIC_TABLES.items()
+}
+def _column_value(path: str, column_type: str) -> str:
+    """SQL for a stored column converted back to its payload value"""
+    column = _column_name(path)
+    if column_type == 'PERCENT':
+        return f"{column} / 10.0"
+    if column_type == 'JSON':
+        # Stored as orjson bytes, which SQLite keeps as a BLOB
+        return f"json(CAST({column} AS TEXT))"
+    return column
+
+def _bucket_value(path: str, column_type: str) -> str:
+    """SQL for a column's payload value averaged over a bucket"""
+    column = _column_name(path)
+    if column_type == 'REAL':
+        return f"AVG({column})"
+    if column_type == 'INTEGER':
+        return f"CAST(AVG({column}) AS INTEGER)"
+    if column_type == 'PERCENT':
+        return f"ROUND(AVG({column})) / 10.0"
+    # Lists such as per-core usage are not averaged
+    return "NULL"
+
+def _json_payload_sql(columns, value_sql) -> str:
+    """SQL that builds the collector payload as JSON from typed columns
+
+    Reads return this text as-is, so history responses never parse and
+    re-serialize the stored values in Python.
+    """
+    tree = {}
+    for path, column_type in columns:
+        *parents, key = path.split('.')
+        node = tree
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[key] = value_sql(path, column_type)
+
+    def leaves(node):
+        for value in node.values():
+            yield from leaves(value) if isinstance(value, dict) else (value,)
+
+    def render(node):
+        fields = []
+        for key, value in node.items():
+            if isinstance(value, dict):
+                all_null = " AND ".join(f"({leaf}) IS NULL" for leaf in leaves(value))
+                value = f"CASE WHEN {all_null} THEN NULL ELSE {render(value)} END"
+            fields.append(f"'{key}', {value}")
+        return f"json_object({', '.join(fields)})"
+
+    return render(tree)
+
+_TYPED_SELECT_SQL = {
+    metric_type: (
+        f"SELECT timestamp, {_json_payload_sql(columns, _column_value)} "
+        f"FROM {_table_name(metric_type)} "
+        "WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp ASC"
+    )
+    for metric_type, columns in METRIC_TABLES.items()
+}
+
+# Downsampled reads: one averaged row per bucket, stamped with the newest
+# sample in it. Params are (start, end, start, bucket_seconds).
+_TYPED_BUCKET_SELECT_SQL = {
+    metric_type: (
+        f"SELECT MAX(timestamp), {_json_payload_sql(columns, _bucket_value)} "
+        f"FROM {_table_name(metric_type)} WHERE timestamp >= ? AND timestamp <= ? "
+        "GROUP BY CAST((timestamp - ?) / ? AS INTEGER) ORDER BY 1 ASC"
+    )
+    for metric_type, columns in METRIC_TABLES.items()
+}
+
+# Metric tables are WITHOUT ROWID so rows are stored in the primary key
+# B-tree: a (type, time) range scan reads the data in place instead of going
+# through a separate index and then looking each row up. Rows are unique per
+# sample time and re-inserts replace.
+METRICS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        metric_type TEXT NOT NULL,
+        timestamp REAL NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (metric_type, timestamp)
+    ) WITHOUT ROWID
+"""
+
+_TYPED_TABLE_SQL = {
+    metric_type: (
+        "CREATE TABLE IF NOT EXISTS {table} (\n"
+        "    timestamp REAL PRIMARY KEY,\n"
+        + ",\n".join(
+            f"    {_column_name(path)} {_declared_type(column_type)}"
+            for path, column_type in columns
+        )
+        + "\n) WITHOUT ROWID"
+    )
+    for metric_type, columns in METRIC_TABLES.items()
+}
+
+# One long-lived writer shared by the collector and admin endpoints, plus a
+# small pool of read-only connections for the history endpoints. Keeping the
+# connections open avoids reopening the db/WAL files on every call and keeps
+# each connection's page cache warm.
+_writer = None
+_writer_lock = threading.Lock()
+_read_pool = queue.Queue(maxsize=READ_POOL_SIZE)
+
+def _open_connection(database, uri: bool = False):
+    """Open a connection with the standard pragmas applied"""
+    # Connections are long-lived, so sqlite3's default per-connection statement
+    # cache keeps the hot inserts and selects from being re-parsed on every call
+    conn = sqlite3.connect(database, timeout=5.0, check_same_thread=False, uri=uri)
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+@contextmanager
+def get_writer():
+    """Context manager for the shared writer connection"""
+    global _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = _open_connection(DB_PATH)
+            _writer.execute("PRAGMA journal_mode=WAL")
+            # Keep a flush batch's dirty pages in memory until commit
+            _writer.execute("PRAGMA cache_spill=OFF")
+            # Checkpoint less often during normal writes; cleanup_old_data
+            # runs a full checkpoint to keep the WAL file bounded
+            _writer.execute("PRAGMA wal_autocheckpoint=10000")
+        try:
+            yield _writer
+        except Exception:
+            _writer.rollback()
+            raise
+
 @contextmanager
 def get_db():
-    """Context manager for database connections"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """Context manager for a pooled read-only database connection"""
+    try:
+        conn = _read_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_connection(f"file:{DB_PATH}?mode=ro", uri=True)
+
     try:
         yield conn
     finally:
-        conn.close()
+        try:
+            _read_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+def close_database():
+    """Close the writer and all pooled read connections"""
+    global _writer
+
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+    while True:
+        try:
+            _read_pool.get_nowait().close()
+        except queue.Empty:
+            break
+
+def _flatten_metric(metric_type: str, data: dict) -> list:
+    """Turn a collector payload into column values for its typed table"""
+    values = []
+    for path, column_type in METRIC_TABLES[metric_type]:
+        value = data
+        for key in path.split('.'):
+            value = value.get(key) if value else None
+        if value is not None:
+            if column_type == 'JSON':
+                value = orjson.dumps(value)
+            elif column_type == 'PERCENT':
+                value = round(value * 10)
+        values.append(value)
+    return values
+
+def _add_missing_columns(conn):
+    """Add columns introduced after a typed table was created"""
+    for metric_type, columns in METRIC_TABLES.items():
+        table = _table_name(metric_type)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for path, column_type in columns:
+            if _column_name(path) not in existing:
+                conn.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {_column_name(path)} {_declared_type(column_type)}"
+                )
+
+def _rebuild_table(conn, table: str, create_sql: str, columns: str, select: str = None):
+    """Recreate a table from create_sql, copying rows across via select"""
+    conn.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    conn.execute(create_sql.format(table=table))
+    conn.execute(
+        f"INSERT OR REPLACE INTO {table} ({columns}) SELECT {select or columns} FROM {table}_old"
+    )
+    conn.execute(f"DROP TABLE {table}_old")
+
+def _rebuild_without_rowid(conn, table: str, create_sql: str, columns: str):
+    """Copy a table created with a rowid into its WITHOUT ROWID layout"""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if row is None or "WITHOUT ROWID" in row[0].upper():
+        return
+
+    _rebuild_table(conn, table, create_sql, columns)
+
+def _quantize_percent_columns(conn):
+    """Convert percent columns still stored as REAL into INTEGER tenths"""
+    for metric_type, columns in METRIC_TABLES.items():
+        table = _table_name(metric_type)
+        declared = {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})")}
+        percent_columns = [
+            _column_name(path) for path, column_type in columns
+            if column_type == 'PERCENT' and declared.get(_column_name(path)) == 'REAL'
+        ]
+        if not percent_columns:
+            continue
+
+        select = ", ".join(
+            f"CAST(ROUND({column} * 10) AS INTEGER)" if column in percent_columns else column
+            for column in ["timestamp", *(_column_name(path) for path, _ in columns)]
+        )
+        _rebuild_table(
+            conn, table, _TYPED_TABLE_SQL[metric_type],
+            f"timestamp, {_TYPED_COLUMNS[metric_type]}", select
+        )
+
+def _migrate_json_metrics(conn):
+    """Move typed metric rows still stored as JSON into their typed tables"""
+    for metric_type in METRIC_TABLES:
+        rows = conn.execute(
+            "SELECT timestamp, data FROM metrics WHERE metric_type = ?", (metric_type,)
+        )
+        conn.executemany(
+            _TYPED_INSERT_SQL[metric_type],
+            ([timestamp, *_flatten_metric(metric_type, orjson.loads(data))] for timestamp, data in rows)
+        )
+        conn.execute("DELETE FROM metrics WHERE metric_type = ?", (metric_type,))
 
 def init_database():
     """Initialize the database with required tables"""
-    with get_db() as conn:
+    with get_writer() as conn:
         cursor = conn.cursor()
 
-        # Metrics table for system metrics (CPU, memory, disk, temp, network)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp REAL NOT NULL,
-                metric_type TEXT NOT NULL,
-                data TEXT NOT NULL
-            )
-        """)
+        # Let cleanup hand freed pages back to the filesystem without a full
+        # VACUUM. Only takes effect on an existing file after one VACUUM.
+        if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute("VACUUM")
+
+        # Run the schema setup and any migrations as one transaction
+        cursor.execute("BEGIN")
+
+        # Generic metrics table for payloads without a typed table (temperature)
+        cursor.execute(METRICS_TABLE_SQL.format(table="metrics"))
+
+        # Typed tables for CPU, memory, disk and network
+        for metric_type in METRIC_TABLES:
+            cursor.execute(_TYPED_TABLE_SQL[metric_type].format(table=_table_name(metric_type)))
 
         # Docker metrics table
         cursor.execute("""
@@ -46,17 +371,26 @@ def init_database():
             )
         """)
 
+        # Bring databases created by older versions up to date. Percent columns
+        # are quantized before the WITHOUT ROWID rebuild: that rebuild copies
+        # values as-is into the current INTEGER layout, after which REAL percent
+        # columns could no longer be detected
+        _add_missing_columns(conn)
+        _quantize_percent_columns(conn)
+        _rebuild_without_rowid(conn, "metrics", METRICS_TABLE_SQL, "metric_type, timestamp, data")
+        for metric_type in METRIC_TABLES:
+            _rebuild_without_rowid(
+                conn, _table_name(metric_type), _TYPED_TABLE_SQL[metric_type],
+                f"timestamp, {_TYPED_COLUMNS[metric_type]}"
+            )
+        _migrate_json_metrics(conn)
+
         # Create indexes for faster queries
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_metrics_timestamp
             ON metrics(timestamp)
         """)
 
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_metrics_type_timestamp
-            ON metrics(metric_type, timestamp)
-        """)
-
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_docker_timestamp
             ON docker_metrics(timestamp)
@@ -72,59 +406,145 @@ def init_database():
 def insert_metric(metric_type: str, data: dict, timestamp: float = None):
     """Insert a metric into the database"""
     if timestamp is None:
-        timestamp = datetime.now().timestamp()
-
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO metrics (timestamp, metric_type, data) VALUES (?, ?, ?)",
-            (timestamp, metric_type, json.dumps(data))
-        )
-        conn.commit()
+        timestamp = time.time()
+    insert_metrics_bulk([(timestamp, metric_type, data)])
 
 def insert_docker_metric(container_id: str, container_name: str, data: dict, timestamp: float = None):
     """Insert a Docker metric into the database"""
     if timestamp is None:
-        timestamp = datetime.now().timestamp()
+        timestamp = time.time()
+    insert_metrics_bulk((), [(timestamp, container_id, container_name, data)])
 
-    with get_db() as conn:
+def insert_metrics_bulk(metric_rows, docker_rows=()):
+    """Insert system and Docker metrics in a single transaction
+
+    metric_rows are (timestamp, metric_type, data) tuples and docker_rows are
+    (timestamp, container_id, container_name, data) tuples.
+    """
+    typed_rows = {metric_type: [] for metric_type in METRIC_TABLES}
+    json_rows = []
+    for timestamp, metric_type, data in metric_rows:
+        if metric_type in typed_rows:
+            typed_rows[metric_type].append([timestamp, *_flatten_metric(metric_type, data)])
+        else:
+            json_rows.append((timestamp, metric_type, orjson.dumps(data)))
+
+    with get_writer() as conn:
         cursor = conn.cursor()
-        cursor.execute(
+        for metric_type, rows in typed_rows.items():
+            if rows:
+                cursor.executemany(_TYPED_INSERT_SQL[metric_type], rows)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO metrics (timestamp, metric_type, data) VALUES (?, ?, ?)",
+            json_rows
+        )
+        cursor.executemany(
             "INSERT INTO docker_metrics (timestamp, container_id, container_name, data) VALUES (?, ?, ?, ?)",
-            (timestamp, container_id, container_name, json.dumps(data))
+            ((timestamp, container_id, container_name, orjson.dumps(data))
+             for timestamp, container_id, container_name, data in docker_rows)
         )
         conn.commit()
 
-def get_metrics_range(metric_type: str, start_time: float, end_time: float = None):
-    """Get metrics for a specific type within a time range"""
-    if end_time is None:
-        end_time = datetime.now().timestamp()
+def _typed_metrics_range(cursor, metric_type: str, start_time: float, end_time: float,
+                        bucket_seconds: float = None):
+    if bucket_seconds:
+        cursor.execute(
+            _TYPED_BUCKET_SELECT_SQL[metric_type],
+            (start_time, end_time, start_time, bucket_seconds)
+        )
+    else:
+        cursor.execute(_TYPED_SELECT_SQL[metric_type], (start_time, end_time))
+    return [
+        {"timestamp": timestamp, "data": orjson.Fragment(data)}
+        for timestamp, data in cursor
+    ]
 
-    with get_db() as conn:
-        cursor = conn.cursor()
+def _json_metrics_range(cursor, metric_types: list, start_time: float, end_time: float,
+                        bucket_seconds: float = None):
+    placeholders = ", ".join("?" * len(metric_types))
+    if bucket_seconds:
+        # SQLite takes bare columns from the row that matched MAX()
         cursor.execute(
-            """
-            SELECT timestamp, data
+            f"""
+            SELECT metric_type, MAX(timestamp) AS timestamp, data
             FROM metrics
-            WHERE metric_type = ? AND timestamp >= ? AND timestamp <= ?
-            ORDER BY timestamp ASC
+            WHERE metric_type IN ({placeholders}) AND timestamp >= ? AND timestamp <= ?
+            GROUP BY metric_type, CAST((timestamp - ?) / ? AS INTEGER)
+            ORDER BY metric_type, timestamp ASC
             """,
-            (metric_type, start_time, end_time)
+            (*metric_types, start_time, end_time, start_time, bucket_seconds)
         )
+    else:
+        cursor.execute(
+            f"""
+            SELECT metric_type, timestamp, data
+            FROM metrics
+            WHERE metric_type IN ({placeholders}) AND timestamp >= ? AND timestamp <= ?
+            ORDER BY metric_type, timestamp ASC
+            """,
+            (*metric_types, start_time, end_time)
+        )
+
+    results = {metric_type: [] for metric_type in metric_types}
+    for metric_type, timestamp, data in cursor:
+        results[metric_type].append({"timestamp": timestamp, "data": orjson.Fragment(data)})
+    return results
+
+def get_metrics_range(metric_type: str, start_time: float, end_time: float = None,
+                      bucket_seconds: float = None):
+    """Get metrics for a specific type within a time range
+
+    With bucket_seconds set, samples are downsampled in SQL to one row per
+    bucket: typed metrics are averaged, JSON metrics keep the newest sample.
+    Each row's data is an orjson.Fragment of the stored JSON, to be returned
+    through ORJSONResponse without decoding.
+    """
+    if end_time is None:
+        end_time = time.time()
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        if metric_type in METRIC_TABLES:
+            return _typed_metrics_range(cursor, metric_type, start_time, end_time, bucket_seconds)
+
+        return _json_metrics_range(
+            cursor, [metric_type], start_time, end_time, bucket_seconds
+        )[metric_type]
 
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                "timestamp": row["timestamp"],
-                "data": json.loads(row["data"])
-            })
+def get_metrics_multi(metric_types: list, start_time: float, end_time: float = None,
+                      bucket_seconds: float = None):
+    """Get several metric types for the same time range on one connection
 
-        return results
+    Returns a dict of metric_type -> rows, shaped like get_metrics_range.
+    JSON-stored types are fetched together with a single IN query.
+    """
+    if end_time is None:
+        end_time = time.time()
+
+    results = {}
+    with get_db() as conn:
+        cursor = conn.cursor()
+
+        for metric_type in metric_types:
+            if metric_type in METRIC_TABLES:
+                results[metric_type] = _typed_metrics_range(
+                    cursor, metric_type, start_time, end_time, bucket_seconds
+                )
+
+        json_types = [t for t in metric_types if t not in METRIC_TABLES]
+        if json_types:
+            results.update(_json_metrics_range(cursor, json_types, start_time, end_time, bucket_seconds))
+
+    return results
 
 def get_docker_metrics_range(container_name: str, start_time: float, end_time: float = None):
-    """Get Docker metrics for a specific container within a time range"""
+    """Get Docker metrics for a specific container within a time range
+
+    Each row's data is an orjson.Fragment, as in get_metrics_range.
+    """
     if end_time is None:
-        end_time = datetime.now().timestamp()
+        end_time = time.time()
 
     with get_db() as conn:
         cursor = conn.cursor()
@@ -138,24 +558,29 @@ def get_docker_metrics_range(container_name: str, start_time: float, end_time: f
             (container_name, start_time, end_time)
         )
 
-        results = []
-        for row in cursor.fetchall():
-            results.append({
-                "timestamp": row["timestamp"],
-                "data": json.loads(row["data"])
-            })
-
-        return results
+        return [
+            {"timestamp": timestamp, "data": orjson.Fragment(data)}
+            for timestamp, data in cursor
+        ]
 
 def cleanup_old_data(days: int = 7):
     """Delete metrics older than specified days"""
-    cutoff_time = (datetime.now() - timedelta(days=days)).timestamp()
+    cutoff_time = time.time() - days * 86400
 
-    with get_db() as conn:
+    with get_writer() as conn:
         cursor = conn.cursor()
-        cursor.execute("DELETE FROM metrics WHERE timestamp < ?", (cutoff_time,))
-        cursor.execute("DELETE FROM docker_metrics WHERE timestamp < ?", (cutoff_time,))
-        deleted_count = cursor.rowcount
+        tables = ["metrics", "docker_metrics"] + [_table_name(t) for t in METRIC_TABLES]
+        deleted_count = 0
+        for table in tables:
+            cursor.execute(f"DELETE FROM {table} WHERE timestamp < ?", (cutoff_time,))
+            deleted_count += cursor.rowcount
         conn.commit()
 
+        # Release the freed pages so the file does not stay at its peak size
+        # (the pragma frees pages as it is stepped, so drain it)
+        cursor.execute("PRAGMA incremental_vacuum").fetchall()
+
+        # Fold the WAL back into the database and truncate it
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
         return deleted_count
\ No newline at end of file
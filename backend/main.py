@@ -1,8 +1,9 @@
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import asyncio
-from datetime import datetime
+import time
 from contextlib import asynccontextmanager
 
 from metrics.collectors import (
@@ -14,7 +15,7 @@ from metrics.collectors import (
     get_system_uptime
 )
 from metrics.docker_collectors import get_docker_containers, get_docker_images
-from database import init_database, cleanup_old_data
+from database import init_database, cleanup_old_data, close_database
 from metrics_history import metrics_history
 from service_health import service_health_checker
 
@@ -23,14 +24,16 @@ async def collect_metrics_task():
     """Background task to collect metrics every 2 seconds"""
     while True:
         try:
-            timestamp = datetime.now().timestamp()
+            timestamp = time.time()
 
-            # Collect system metrics
-            cpu_data = get_cpu_usage()
-            memory_data = get_memory_usage()
-            disk_data = get_disk_usage()
-            temp_data = get_temperature()
-            network_data = get_network_stats()
+            # Collect system metrics in worker threads so the event loop stays free
+            cpu_data, memory_data, disk_data, temp_data, network_data = await asyncio.gather(
+                asyncio.to_thread(get_cpu_usage),
+                asyncio.to_thread(get_memory_usage),
+                asyncio.to_thread(get_disk_usage),
+                asyncio.to_thread(get_temperature),
+                asyncio.to_thread(get_network_stats),
+            )
 
             # Store in history
             await metrics_history.add_metric('cpu', cpu_data, timestamp)
@@ -49,9 +52,6 @@ async def collect_metrics_task():
             #             container,
             #             timestamp
             #         )
-
-            # Flush to database periodically
-            await metrics_history.flush_to_database()
         except Exception as e:
             print(f"Error collecting metrics: {e}")
         await asyncio.sleep(2)
@@ -73,8 +73,9 @@ async def lifespan(app: FastAPI):
     init_database()
     print("Database initialized")
 
-    # Start background metrics collection
+    # Start background metrics collection, flushed to the database on a timer
     metrics_task = asyncio.create_task(collect_metrics_task())
+    metrics_history.start()
     print("Metrics collection started")
     
     # Start background service health checks
@@ -97,9 +98,13 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
     
+    await metrics_history.stop()
     print("Background tasks stopped")
 
-app = FastAPI(title="Pi Dashboard API", lifespan=lifespan)
+    await service_health_checker.aclose()
+    close_database()
+
+app = FastAPI(title="Pi Dashboard API", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware for React frontend
 app.add_middleware(
@@ -114,54 +119,108 @@ app.add_middleware(
 def read_root():
     return {"status": "ok", "message": "Pi Dashboard API"}
 
+async def latest_or_collect(metric_type: str, collector):
+    """Serve the background task's latest sample, collecting fresh data if it is stale"""
+    data = metrics_history.get_latest(metric_type)
+    return data if data is not None else await asyncio.to_thread(collector)
+
 @app.get("/api/metrics")
-def get_metrics():
+async def get_metrics():
+    cpu, memory, disk, temperature, network, uptime = await asyncio.gather(
+        latest_or_collect('cpu', get_cpu_usage),
+        latest_or_collect('memory', get_memory_usage),
+        latest_or_collect('disk', get_disk_usage),
+        latest_or_collect('temperature', get_temperature),
+        latest_or_collect('network', get_network_stats),
+        asyncio.to_thread(get_system_uptime),
+    )
     return {
-        "cpu": get_cpu_usage(),
-        "memory": get_memory_usage(),
-        "disk": get_disk_usage(),
-        "temperature": get_temperature(),
-        "network": get_network_stats(),
-        "uptime": get_system_uptime()
+        "cpu": cpu,
+        "memory": memory,
+        "disk": disk,
+        "temperature": temperature,
+        "network": network,
+        "uptime": uptime
     }
 
 @app.get("/api/docker")
-def get_docker_info():
+async def get_docker_info():
+    containers, images = await asyncio.gather(
+        asyncio.to_thread(get_docker_containers),
+        asyncio.to_thread(get_docker_images),
+    )
     return {
-        "containers": get_docker_containers(),
-        "images": get_docker_images()
+        "containers": containers,
+        "images": images
     }
 
 @app.get("/api/metrics/cpu")
-def get_cpu():
-    return get_cpu_usage()
+async def get_cpu():
+    return await latest_or_collect('cpu', get_cpu_usage)
 
 @app.get("/api/metrics/memory")
-def get_memory():
-    return get_memory_usage()
+async def get_memory():
+    return await latest_or_collect('memory', get_memory_usage)
 
 @app.get("/api/metrics/disk")
-def get_disk():
-    return get_disk_usage()
+async def get_disk():
+    return await latest_or_collect('disk', get_disk_usage)
 
 @app.get("/api/metrics/temperature")
-def get_temp():
-    return get_temperature()
+async def get_temp():
+    return await latest_or_collect('temperature', get_temperature)
 
 @app.get("/api/metrics/network")
-def get_network():
-    return get_network_stats()
+async def get_network():
+    return await latest_or_collect('network', get_network_stats)
 
 @app.get("/api/docker/containers")
-def get_containers():
-    return get_docker_containers()
+async def get_containers():
+    return await asyncio.to_thread(get_docker_containers)
 
 @app.get("/api/docker/images")
-def get_images():
-    return get_docker_images()
+async def get_images():
+    return await asyncio.to_thread(get_docker_images)
 
 
 # Historical metrics endpoints
+VALID_METRICS = ['cpu', 'memory', 'disk', 'temperature', 'network']
+VALID_RANGES = [5, 15, 60, 360, 1440]
+
+# Longer ranges are downsampled in the database to roughly this many points
+HISTORY_MAX_POINTS = 300
+
+def validate_range(range_minutes: int):
+    if range_minutes not in VALID_RANGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid range. Must be one of: {VALID_RANGES}"
+        )
+
+@app.get("/api/metrics/history")
+async def get_metrics_history(
+    types: str = Query(default=",".join(VALID_METRICS), description="Comma-separated metric types"),
+    range: int = Query(default=5, description="Time range in minutes (5, 15, 60, 360, 1440)")
+):
+    """Get historical data for several metric types in one request"""
+    metric_types = list(dict.fromkeys(t.strip() for t in types.split(",") if t.strip()))
+    invalid = [t for t in metric_types if t not in VALID_METRICS]
+    if not metric_types or invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid metric type. Must be one of: {VALID_METRICS}"
+        )
+    validate_range(range)
+
+    bucket_seconds = max(2, range * 60 // HISTORY_MAX_POINTS)
+    metrics = await metrics_history.get_historical_metrics_multi(metric_types, range, bucket_seconds)
+
+    # Returned directly: rows carry raw JSON fragments that only orjson can encode
+    return ORJSONResponse({
+        "range_minutes": range,
+        "metrics": metrics
+    })
+
 @app.get("/api/metrics/history/{metric_type}")
 async def get_metric_history(
     metric_type: str,
@@ -169,27 +228,21 @@ async def get_metric_history(
 
 ):
     """Get historical data for a specific metric type"""
-    valid_metrics = ['cpu', 'memory', 'disk', 'temperature', 'network']
-    if metric_type not in valid_metrics:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid metric type. Must be one of: {valid_metrics}"
-        )
-
-    valid_ranges = [5, 15, 60, 360, 1440]
-    if range not in valid_ranges:
+    if metric_type not in VALID_METRICS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid range. Must be one of: {valid_ranges}"
+            detail=f"Invalid metric type. Must be one of: {VALID_METRICS}"
         )
+    validate_range(range)
 
-    data = await metrics_history.get_historical_metrics(metric_type, range)
+    bucket_seconds = max(2, range * 60 // HISTORY_MAX_POINTS)
+    data = await metrics_history.get_historical_metrics(metric_type, range, bucket_seconds)
 
-    return {
+    return ORJSONResponse({
         "metric_type": metric_type,
         "range_minutes": range,
         "data": data
-    }
+    })
 
 @app.get("/api/docker/history/{container_name}")
 async def get_docker_container_history(
@@ -197,20 +250,15 @@ async def get_docker_container_history(
     range: int = Query(default=5, description="Time range in minutes (5, 15, 60, 360, 1440)")
 ):
     """Get historical data for a specific Docker container"""
-    valid_ranges = [5, 15, 60, 360, 1440]
-    if range not in valid_ranges:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid range. Must be one of: {valid_ranges}"
-        )
+    validate_range(range)
 
     data = await metrics_history.get_historical_docker_metrics(container_name, range)
 
-    return {
+    return ORJSONResponse({
         "container_name": container_name,
         "range_minutes": range,
         "data": data
-    }
+    })
 
 
 @app.get("/api/docker/containers/list")
@@ -1,17 +1,45 @@
 import psutil
 import os
+import time
 from pathlib import Path
 from datetime import timedelta
 
+# Prime the CPU counters so the first non-blocking sample has a baseline
+psutil.cpu_percent(interval=None)
+psutil.cpu_percent(interval=None, percpu=True)
+
 def get_cpu_usage():
-    """Get CPU usage statistics"""
+    """Get CPU usage statistics since the previous call (non-blocking)"""
+    freq = psutil.cpu_freq()
     return {
-        "percent": psutil.cpu_percent(interval=1),
-        "per_cpu": psutil.cpu_percent(interval=1, percpu=True),
+        "percent": psutil.cpu_percent(interval=None),
+        "per_cpu": psutil.cpu_percent(interval=None, percpu=True),
         "count": psutil.cpu_count(),
-        "frequency": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None
+        "frequency": freq._asdict() if freq else None
     }
 
+# Previous (monotonic time, counters) per counter group, for per-second rates
+_previous_counters = {}
+
+def counter_rates(key: str, counters: dict) -> dict:
+    """Per-second rate of each counter since the previous call for this key
+
+    Rates are None on the first call and after a counter reset.
+    """
+    now = time.monotonic()
+    previous = _previous_counters.get(key)
+    _previous_counters[key] = (now, counters)
+
+    if previous is None or now <= previous[0]:
+        return {name: None for name in counters}
+
+    elapsed = now - previous[0]
+    rates = {}
+    for name, value in counters.items():
+        delta = value - previous[1][name]
+        rates[name] = round(delta / elapsed) if delta >= 0 else None
+    return rates
+
 def get_memory_usage():
     """Get memory usage statistics"""
     mem = psutil.virtual_memory()
@@ -33,6 +61,10 @@ def get_disk_usage():
     """Get disk usage statistics"""
     disk = psutil.disk_usage('/')
     io = psutil.disk_io_counters()
+    io_rates = counter_rates("disk", {
+        "read_bytes": io.read_bytes,
+        "write_bytes": io.write_bytes
+    }) if io else None
     
     return {
         "total": disk.total,
@@ -43,10 +75,33 @@ def get_disk_usage():
             "read_bytes": io.read_bytes,
             "write_bytes": io.write_bytes,
             "read_count": io.read_count,
-            "write_count": io.write_count
+            "write_count": io.write_count,
+            "read_bytes_per_sec": io_rates["read_bytes"],
+            "write_bytes_per_sec": io_rates["write_bytes"]
         } if io else None
     }
 
+def discover_thermal_zones():
+    """Find thermal zones with a readable temperature, as (name, type, temp_file)"""
+    thermal_zones = Path("/sys/class/thermal")
+    if not thermal_zones.exists():
+        return []
+
+    zones = []
+    for zone in sorted(thermal_zones.glob("thermal_zone*")):
+        temp_file = zone / "temp"
+        type_file = zone / "type"
+        if temp_file.exists():
+            try:
+                zone_type = type_file.read_text().strip() if type_file.exists() else "unknown"
+            except IOError:
+                zone_type = "unknown"
+            zones.append((zone.name, zone_type, temp_file))
+    return zones
+
+# Zones and their types are fixed at boot, so only the temp files are re-read
+THERMAL_ZONES = discover_thermal_zones()
+
 def get_temperature():
     """Get system temperature - works on Raspberry Pi"""
     temps = {}
@@ -62,32 +117,30 @@ def get_temperature():
             }
     
     # Fallback to reading thermal zones directly (common on Pi)
-    thermal_zones = Path("/sys/class/thermal")
-    if thermal_zones.exists():
-        zones = []
-        for zone in thermal_zones.glob("thermal_zone*"):
-            temp_file = zone / "temp"
-            type_file = zone / "type"
-            if temp_file.exists():
-                try:
-                    temp = int(temp_file.read_text().strip()) / 1000.0
-                    zone_type = type_file.read_text().strip() if type_file.exists() else "unknown"
-                    zones.append({
-                        "zone": zone.name,
-                        "type": zone_type,
-                        "temperature": temp
-                    })
-                except (ValueError, IOError):
-                    pass
-        
-        if zones:
-            temps["thermal_zones"] = zones
+    zones = []
+    for zone_name, zone_type, temp_file in THERMAL_ZONES:
+        try:
+            temp = int(temp_file.read_text().strip()) / 1000.0
+            zones.append({
+                "zone": zone_name,
+                "type": zone_type,
+                "temperature": temp
+            })
+        except (ValueError, IOError):
+            pass
+
+    if zones:
+        temps["thermal_zones"] = zones
     
     return temps
 
 def get_network_stats():
     """Get network statistics"""
     net_io = psutil.net_io_counters()
+    rates = counter_rates("network", {
+        "bytes_sent": net_io.bytes_sent,
+        "bytes_recv": net_io.bytes_recv
+    })
     
     return {
         "bytes_sent": net_io.bytes_sent,
@@ -97,7 +150,9 @@ def get_network_stats():
         "errin": net_io.errin,
         "errout": net_io.errout,
         "dropin": net_io.dropin,
-        "dropout": net_io.dropout
+        "dropout": net_io.dropout,
+        "bytes_sent_per_sec": rates["bytes_sent"],
+        "bytes_recv_per_sec": rates["bytes_recv"]
     }
 
 def get_system_uptime():
@@ -1,12 +1,24 @@
 import docker
+from datetime import datetime, timezone
 from docker.errors import DockerException
 
+# Shared client; from_env() negotiates the API version with the daemon, so it
+# is only created once and retried on later calls if the daemon was down.
+_client = None
+
 def get_docker_client():
     """Get Docker client"""
-    try:
-        return docker.from_env()
-    except DockerException as e:
-        return None
+    global _client
+    if _client is None:
+        try:
+            _client = docker.from_env()
+        except DockerException as e:
+            return None
+    return _client
+
+def format_created(created):
+    """Format a Docker list API creation time (unix seconds) as ISO 8601"""
+    return datetime.fromtimestamp(created, tz=timezone.utc).isoformat() if created else ''
 
 def get_docker_containers():
     """Get information about all Docker containers"""
@@ -15,17 +27,27 @@ def get_docker_containers():
         return {"error": "Cannot connect to Docker daemon"}
     
     try:
-        containers = client.containers.list(all=True)
+        # The low-level list call returns plain dicts in one request, whereas
+        # containers.list() inspects every container individually
+        containers = client.api.containers(all=True)
         
         container_info = []
+        running = stopped = 0
         for container in containers:
+            status = container.get('State', 'unknown')
+            if status == 'running':
+                running += 1
+            elif status == 'exited':
+                stopped += 1
+
             # Stats collection commented out for performance - very slow on some systems
             # Uncomment if you need per-container CPU/memory/network stats
+            # (and set "stats": stats below)
             # stats = None
-            # if container.status == 'running':
+            # if status == 'running':
             #     try:
             #         # Get stats without streaming
-            #         stats_stream = container.stats(stream=False)
+            #         stats_stream = client.api.stats(container['Id'], stream=False)
             #         stats = {
             #             "cpu_percent": calculate_cpu_percent(stats_stream),
             #             "memory_usage": stats_stream['memory_stats'].get('usage', 0),
@@ -37,21 +59,22 @@ def get_docker_containers():
             #     except Exception:
             #         stats = None
 
+            names = container.get('Names') or []
             container_info.append({
-                "id": container.short_id,
-                "name": container.name,
-                "image": container.image.tags[0] if container.image.tags else "unknown",
-                "status": container.status,
-                "state": container.attrs['State'],
-                "created": container.attrs['Created'],
+                "id": container['Id'][:12],
+                "name": names[0].lstrip('/') if names else container['Id'][:12],
+                "image": container.get('Image') or "unknown",
+                "status": status,
+                "status_text": container.get('Status', ''),  # e.g. "Up 2 hours"
+                "created": format_created(container.get('Created')),
                 "stats": None  # Stats disabled for performance
             })
         
         return {
             "containers": container_info,
-            "total": len(containers),
-            "running": len([c for c in containers if c.status == 'running']),
-            "stopped": len([c for c in containers if c.status == 'exited']),
+            "total": len(container_info),
+            "running": running,
+            "stopped": stopped,
         }
     except Exception as e:
         return {"error": str(e)}
@@ -107,20 +130,21 @@ def get_docker_images():
         return {"error": "Cannot connect to Docker daemon"}
     
     try:
-        images = client.images.list()
+        # Low-level list call for the same reason as get_docker_containers
+        images = client.api.images()
         
         image_info = []
         for image in images:
             image_info.append({
-                "id": image.short_id,
-                "tags": image.tags,
-                "size": image.attrs.get('Size', 0),
-                "created": image.attrs.get('Created', ''),
+                "id": image['Id'][:17] if image['Id'].startswith('sha256:') else image['Id'][:10],
+                "tags": [tag for tag in image.get('RepoTags') or [] if tag != '<none>:<none>'],
+                "size": image.get('Size', 0),
+                "created": format_created(image.get('Created')),
             })
         
         return {
             "images": image_info,
-            "total": len(images)
+            "total": len(image_info)
         }
     except Exception as e:
         return {"error": str(e)}
\ No newline at end of file
@@ -1,26 +1,143 @@
-from collections import deque
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
 import asyncio
 import time
-from typing import Dict, List
-from database import insert_metric, insert_docker_metric, get_metrics_range, get_docker_metrics_range
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from database import insert_metrics_bulk, get_metrics_range, get_metrics_multi, get_docker_metrics_range
+
+
+@dataclass(slots=True)
+class Entry:
+    """A buffered sample handed to callers; orjson encodes it as {"timestamp": ..., "data": ...}"""
+    timestamp: float
+    data: Any
+
+
+class RingBuffer:
+    """Fixed-size ring of samples, stored as a timestamp array plus a parallel payload list
+
+    Samples must be appended in timestamp order; once full, the oldest slot is overwritten.
+    """
+
+    __slots__ = ('capacity', 'timestamps', 'data', 'head', 'size', 'count', 'cursors')
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.data: List[Any] = [None] * capacity
+        self.head = 0  # Slot the next sample is written to
+        self.size = 0
+        self.count = 0  # Samples ever appended; sample n lives in slot n % capacity
+        # Cursor key -> (last cutoff_time, sequence number of the first sample at or after it)
+        self.cursors: Dict[Any, Tuple[float, int]] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, timestamp: float, data: Any):
+        self.timestamps[self.head] = timestamp
+        self.data[self.head] = data
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+        if self.size < self.capacity:
+            self.size += 1
+
+    def _slots(self, start: int = 0, stop: int = None) -> Iterator[int]:
+        """Physical slot numbers for logical indexes start..stop, oldest first"""
+        oldest = self.head - self.size
+        stop = self.size if stop is None else stop
+        return (slot % self.capacity for slot in range(oldest + start, oldest + stop))
+
+    def _bisect(self, bisect, timestamp: float) -> int:
+        timestamps, capacity, oldest = self.timestamps, self.capacity, self.head - self.size
+        return bisect(range(self.size), timestamp,
+                      key=lambda i: timestamps[(oldest + i) % capacity])
+
+    def index_of(self, cutoff_time: float) -> int:
+        """Logical index of the first sample at or after cutoff_time"""
+        return self._bisect(bisect_left, cutoff_time)
+
+    def index_after(self, timestamp: float) -> int:
+        """Logical index of the first sample strictly after timestamp"""
+        return self._bisect(bisect_right, timestamp)
+
+    def index_from_cursor(self, key: Any, cutoff_time: float) -> int:
+        """index_of for callers that poll a sliding window with a cutoff that only moves forward
+
+        Resumes from where the previous call with the same key stopped, so steady polling
+        steps over just the samples that aged out since then.
+        """
+        oldest = self.count - self.size
+        last_cutoff, seq = self.cursors.get(key, (cutoff_time, oldest))
+        if cutoff_time < last_cutoff:
+            # Clock stepped backwards; fall back to a binary search
+            seq = oldest + self.index_of(cutoff_time)
+        else:
+            timestamps, capacity = self.timestamps, self.capacity
+            seq = max(seq, oldest)
+            while seq < self.count and timestamps[seq % capacity] < cutoff_time:
+                seq += 1
+        self.cursors[key] = (cutoff_time, seq)
+        return seq - oldest
+
+    def items(self, start: int = 0, stop: int = None) -> Iterator[Tuple[float, Any]]:
+        """(timestamp, data) pairs for logical indexes start..stop, oldest first"""
+        timestamps, data = self.timestamps, self.data
+        return ((timestamps[slot], data[slot]) for slot in self._slots(start, stop))
+
+    def entries(self, start: int = 0) -> List[Entry]:
+        """Samples from logical index start to the newest"""
+        return [Entry(timestamp, data) for timestamp, data in self.items(start)]
+
+    def entries_since(self, cutoff_time: float, cursor: Any = None) -> List[Entry]:
+        """Samples at or after cutoff_time, located via the named cursor if one is given"""
+        if cursor is None:
+            return self.entries(self.index_of(cutoff_time))
+        return self.entries(self.index_from_cursor(cursor, cutoff_time))
+
+
+def _append_recent(buffer: Optional[RingBuffer], db_results: List[dict]) -> List:
+    """Append buffered entries from the last 5 minutes that are newer than the last database row"""
+    if buffer is None:
+        return db_results
+
+    start = buffer.index_from_cursor(5, time.time() - 5 * 60)
+    if not db_results:
+        # No DB results, just return buffer
+        return buffer.entries(start)
+
+    # Both sides are in time order, so one search finds where the buffer takes over
+    start = max(start, buffer.index_after(db_results[-1]['timestamp']))
+    db_results.extend(buffer.entries(start))
+    return db_results
+
 
 class MetricsHistory:
     """Manages in-memory metrics buffer and database persistence"""
 
-    def __init__(self, buffer_size: int = 450):  # 15 min at 2-sec intervals
+    def __init__(self, buffer_size: int = 450,  # 15 min at 2-sec intervals
+                 max_containers: int = 256):
         self.buffer_size = buffer_size
-        self.metrics_buffer: Dict[str, deque] = {
-            'cpu': deque(maxlen=buffer_size),
-            'memory': deque(maxlen=buffer_size),
-            'disk': deque(maxlen=buffer_size),
-            'temperature': deque(maxlen=buffer_size),
-            'network': deque(maxlen=buffer_size),
+        self.max_containers = max_containers
+        self.metrics_buffer: Dict[str, RingBuffer] = {
+            'cpu': RingBuffer(buffer_size),
+            'memory': RingBuffer(buffer_size),
+            'disk': RingBuffer(buffer_size),
+            'temperature': RingBuffer(buffer_size),
+            'network': RingBuffer(buffer_size),
         }
-        self.docker_buffer: Dict[str, deque] = {}  # container_name -> deque
+        # container_name -> RingBuffer, least recently updated first so
+        # containers that have gone away are evicted once the cap is reached
+        self.docker_buffer: OrderedDict[str, RingBuffer] = OrderedDict()
+        # Most recent sample per metric type, served by the live endpoints
+        self.latest: Dict[str, tuple] = {}  # metric_type -> (timestamp, data)
+        # Only serializes flushes; adds and reads run on the event loop without
+        # awaiting, so they never observe a half-updated buffer
         self.lock = asyncio.Lock()
-        self.last_flush = time.time()
         self.flush_interval = 60  # Flush to DB every 60 seconds
+        self._flush_task: Optional[asyncio.Task] = None
         # Track last flushed timestamp to avoid duplicates
         self.last_flushed_timestamp: Dict[str, float] = {}
         self.last_flushed_docker_timestamp: Dict[str, float] = {}
@@ -28,156 +145,191 @@ class MetricsHistory:
     async def add_metric(self, metric_type: str, data: dict, timestamp: float = None):
         """Add a metric to the in-memory buffer"""
         if timestamp is None:
-            timestamp = datetime.now().timestamp()
+            timestamp = time.time()
 
-        async with self.lock:
-            if metric_type in self.metrics_buffer:
-                self.metrics_buffer[metric_type].append({
-                    'timestamp': timestamp,
-                    'data': data
-                })
+        buffer = self.metrics_buffer.get(metric_type)
+        if buffer is not None:
+            buffer.append(timestamp, data)
+        self.latest[metric_type] = (timestamp, data)
+
+    def get_latest(self, metric_type: str, max_age: float = 3.0):
+        """Get the most recent collected sample, or None if it is older than max_age seconds"""
+        latest = self.latest.get(metric_type)
+        if latest is None or time.time() - latest[0] > max_age:
+            return None
+        return latest[1]
 
     async def add_docker_metric(self, container_name: str, data: dict, timestamp: float = None):
         """Add a Docker metric to the in-memory buffer"""
         if timestamp is None:
-            timestamp = datetime.now().timestamp()
-
-        async with self.lock:
-            if container_name not in self.docker_buffer:
-                self.docker_buffer[container_name] = deque(maxlen=self.buffer_size)
-
-            self.docker_buffer[container_name].append({
-                'timestamp': timestamp,
-                'data': data
-            })
-
-    async def get_recent_metrics(self, metric_type: str, minutes: int = 15) -> List[dict]:
+            timestamp = time.time()
+
+        buffer = self.docker_buffer.get(container_name)
+        if buffer is None:
+            buffer = self.docker_buffer[container_name] = RingBuffer(self.buffer_size)
+            if len(self.docker_buffer) > self.max_containers:
+                evicted, _ = self.docker_buffer.popitem(last=False)
+                self.last_flushed_docker_timestamp.pop(evicted, None)
+        else:
+            self.docker_buffer.move_to_end(container_name)
+        buffer.append(timestamp, data)
+
+    async def get_recent_metrics(self, metric_type: str, minutes: int = 15) -> List[Entry]:
         """Get recent metrics from in-memory buffer"""
-        cutoff_time = (datetime.now() - timedelta(minutes=minutes)).timestamp()
+        cutoff_time = time.time() - minutes * 60
 
-        async with self.lock:
-            if metric_type not in self.metrics_buffer:
-                return []
+        buffer = self.metrics_buffer.get(metric_type)
+        if buffer is None:
+            return []
 
-            return [
-                entry for entry in self.metrics_buffer[metric_type]
-                if entry['timestamp'] >= cutoff_time
-            ]
+        return buffer.entries_since(cutoff_time, cursor=minutes)
 
-    async def get_recent_docker_metrics(self, container_name: str, minutes: int = 15) -> List[dict]:
+    async def get_recent_docker_metrics(self, container_name: str, minutes: int = 15) -> List[Entry]:
         """Get recent Docker metrics from in-memory buffer"""
-        cutoff_time = (datetime.now() - timedelta(minutes=minutes)).timestamp()
+        cutoff_time = time.time() - minutes * 60
 
-        async with self.lock:
-            if container_name not in self.docker_buffer:
-                return []
+        buffer = self.docker_buffer.get(container_name)
+        if buffer is None:
+            return []
+
+        return buffer.entries_since(cutoff_time, cursor=minutes)
 
-            return [
-                entry for entry in self.docker_buffer[container_name]
-                if entry['timestamp'] >= cutoff_time
-            ]
+    async def get_historical_metrics(self, metric_type: str, range_minutes: int,
+                                     bucket_seconds: float = None) -> List[dict]:
+        """Get historical metrics, combining in-memory and database
 
-    async def get_historical_metrics(self, metric_type: str, range_minutes: int) -> List[dict]:
-        """Get historical metrics, combining in-memory and database"""
-        now = datetime.now()
-        start_time = (now - timedelta(minutes=range_minutes)).timestamp()
+        bucket_seconds downsamples the database part of the result.
+        """
+        start_time = time.time() - range_minutes * 60
 
         # For ranges <= 15 minutes, use in-memory buffer
         if range_minutes <= 15:
             return await self.get_recent_metrics(metric_type, range_minutes)
 
         # For longer ranges, query database
-        db_results = get_metrics_range(metric_type, start_time)
+        # Read on a worker thread (pooled read-only connection) so concurrent
+        # history requests don't block the event loop or each other
+        db_results = await asyncio.to_thread(
+            get_metrics_range, metric_type, start_time, bucket_seconds=bucket_seconds
+        )
 
-        # If we have recent data in memory that's not in DB yet, append it
-        recent_buffer = await self.get_recent_metrics(metric_type, 5)
-        if recent_buffer and db_results:
-            last_db_time = db_results[-1]['timestamp']
-            newer_buffer = [entry for entry in recent_buffer if entry['timestamp'] > last_db_time]
-            db_results.extend(newer_buffer)
-        elif recent_buffer and not db_results:
-            # No DB results, just return buffer
-            return recent_buffer
+        return _append_recent(self.metrics_buffer.get(metric_type), db_results)
 
-        return db_results
+    async def get_historical_metrics_multi(self, metric_types: List[str], range_minutes: int,
+                                           bucket_seconds: float = None) -> Dict[str, List[dict]]:
+        """Get historical metrics for several types at once, reading the database in one pass"""
+        if range_minutes <= 15:
+            return {
+                metric_type: await self.get_recent_metrics(metric_type, range_minutes)
+                for metric_type in metric_types
+            }
+
+        start_time = time.time() - range_minutes * 60
+        db_results = await asyncio.to_thread(
+            get_metrics_multi, metric_types, start_time, bucket_seconds=bucket_seconds
+        )
+
+        return {
+            metric_type: _append_recent(self.metrics_buffer.get(metric_type), db_results[metric_type])
+            for metric_type in metric_types
+        }
 
     async def get_historical_docker_metrics(self, container_name: str, range_minutes: int) -> List[dict]:
         """Get historical Docker metrics, combining in-memory and database"""
-        now = datetime.now()
-        start_time = (now - timedelta(minutes=range_minutes)).timestamp()
+        start_time = time.time() - range_minutes * 60
 
         # For ranges <= 15 minutes, use in-memory buffer
         if range_minutes <= 15:
             return await self.get_recent_docker_metrics(container_name, range_minutes)
 
         # For longer ranges, query database
-        db_results = get_docker_metrics_range(container_name, start_time)
+        db_results = await asyncio.to_thread(get_docker_metrics_range, container_name, start_time)
 
         # If we have recent data in memory that's not in DB yet, append it
-        recent_buffer = await self.get_recent_docker_metrics(container_name, 5)
-        if recent_buffer and db_results:
-            last_db_time = db_results[-1]['timestamp']
-            newer_buffer = [entry for entry in recent_buffer if entry['timestamp'] > last_db_time]
-            db_results.extend(newer_buffer)
-        elif recent_buffer and not db_results:
-            # No DB results, just return buffer
-            return recent_buffer
-
-        return db_results
+        return _append_recent(self.docker_buffer.get(container_name), db_results)
 
     async def flush_to_database(self):
         """Flush old buffer entries to database"""
-        current_time = time.time()
-
-        # Only flush if enough time has passed
-        if current_time - self.last_flush < self.flush_interval:
-            return
-
         async with self.lock:
-            flush_cutoff = (datetime.now() - timedelta(minutes=5)).timestamp()
+            flush_cutoff = time.time() - 5 * 60
+            metric_rows = []
+            docker_rows = []
+            flushed_timestamps = {}
+            flushed_docker_timestamps = {}
 
-            # Flush system metrics
+            # Collect system metrics older than 5 min and newer than the last flush
             for metric_type, buffer in self.metrics_buffer.items():
-                if len(buffer) > 0:
-                    # Get last flushed timestamp for this metric type
-                    last_flushed = self.last_flushed_timestamp.get(metric_type, 0)
-                    max_flushed_timestamp = last_flushed
-
-                    for entry in buffer:
-                        # Only flush if: older than 5 min AND newer than last flush
-                        if entry['timestamp'] < flush_cutoff and entry['timestamp'] > last_flushed:
-                            insert_metric(metric_type, entry['data'], entry['timestamp'])
-                            max_flushed_timestamp = max(max_flushed_timestamp, entry['timestamp'])
-
-                    # Update last flushed timestamp
-                    if max_flushed_timestamp > last_flushed:
-                        self.last_flushed_timestamp[metric_type] = max_flushed_timestamp
-
-            # Flush Docker metrics
+                last_flushed = self.last_flushed_timestamp.get(metric_type, 0)
+                # Two binary searches bound the eligible run; skip the buffer if it's empty
+                start, stop = buffer.index_after(last_flushed), buffer.index_of(flush_cutoff)
+                if start < stop:
+                    rows = [(timestamp, metric_type, data) for timestamp, data in buffer.items(start, stop)]
+                    metric_rows.extend(rows)
+                    # Buffers are in time order, so the last row is the newest
+                    flushed_timestamps[metric_type] = rows[-1][0]
+
+            # Collect Docker metrics the same way
             for container_name, buffer in self.docker_buffer.items():
-                if len(buffer) > 0:
-                    # Get last flushed timestamp for this container
-                    last_flushed = self.last_flushed_docker_timestamp.get(container_name, 0)
-                    max_flushed_timestamp = last_flushed
-
-                    for entry in buffer:
-                        # Only flush if: older than 5 min AND newer than last flush
-                        if entry['timestamp'] < flush_cutoff and entry['timestamp'] > last_flushed:
-                            # Extract container_id from data if available
-                            container_id = entry['data'].get('id', '')
-                            insert_docker_metric(container_id, container_name, entry['data'], entry['timestamp'])
-                            max_flushed_timestamp = max(max_flushed_timestamp, entry['timestamp'])
-
-                    # Update last flushed timestamp
-                    if max_flushed_timestamp > last_flushed:
-                        self.last_flushed_docker_timestamp[container_name] = max_flushed_timestamp
-
-            self.last_flush = current_time
+                last_flushed = self.last_flushed_docker_timestamp.get(container_name, 0)
+                start, stop = buffer.index_after(last_flushed), buffer.index_of(flush_cutoff)
+                if start < stop:
+                    rows = [
+                        # Extract container_id from data if available
+                        (timestamp, data.get('id', ''), container_name, data)
+                        for timestamp, data in buffer.items(start, stop)
+                    ]
+                    docker_rows.extend(rows)
+                    flushed_docker_timestamps[container_name] = rows[-1][0]
+
+            # Advance the flush markers while still holding the lock so a
+            # concurrent flush can't pick up the same rows
+            previous_timestamps = {mt: self.last_flushed_timestamp.get(mt, 0) for mt in flushed_timestamps}
+            previous_docker_timestamps = {
+                name: self.last_flushed_docker_timestamp.get(name, 0) for name in flushed_docker_timestamps
+            }
+            self.last_flushed_timestamp.update(flushed_timestamps)
+            self.last_flushed_docker_timestamp.update(flushed_docker_timestamps)
+
+        # Write everything in one transaction outside the lock, on a worker
+        # thread (the shared writer connection has its own lock), so producers
+        # and the event loop keep running while SQLite waits on the disk
+        if metric_rows or docker_rows:
+            try:
+                await asyncio.to_thread(insert_metrics_bulk, metric_rows, docker_rows)
+            except Exception:
+                # Roll the markers back so these rows are retried next flush
+                async with self.lock:
+                    self.last_flushed_timestamp.update(previous_timestamps)
+                    self.last_flushed_docker_timestamp.update(previous_docker_timestamps)
+                raise
+
+    async def _flush_loop(self):
+        """Flush to the database every flush_interval seconds"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush_to_database()
+            except Exception as e:
+                print(f"Error flushing metrics: {e}")
+
+    def start(self):
+        """Start the periodic flush task; call from inside the running event loop"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Cancel the periodic flush task"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
 
     async def get_all_container_names(self) -> List[str]:
         """Get list of all containers in the buffer"""
-        async with self.lock:
-            return list(self.docker_buffer.keys())
+        return list(self.docker_buffer.keys())
 
 
 # Global instance
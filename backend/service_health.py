@@ -1,72 +1,124 @@
-import json
+import orjson
 import httpx
 import asyncio
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
+
+
+class PreparedService(NamedTuple):
+    """Per-service fields resolved once when the config is loaded"""
+    name: str
+    url: str
+    health_endpoint: str
+    full_url: str
 
 
 class ServiceHealthChecker:
     """Monitor health of external services defined in services.json"""
     
-    def __init__(self, config_path: str = "services.json"):
+    def __init__(self, config_path: str = "services.json", max_concurrency: int = 16,
+                 check_budget: float = 10.0):
         self.config_path = Path(config_path)
         self.services: List[Dict] = []
+        self._prepared: List[PreparedService] = []  # Enabled services only
         self.health_status: Dict[str, Dict] = {}
+        self._config_mtime: Optional[int] = None  # st_mtime_ns of the loaded config
+        # One pooled client for every check so connections are kept alive between
+        # polls, and a semaphore capping in-flight requests. Both belong to the running
+        # event loop, so they're created on the first cycle and dropped by aclose(),
+        # giving a restarted app fresh ones
+        self.client: Optional[httpx.AsyncClient] = None
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.max_concurrency = max_concurrency
+        # Bound how long one polling cycle can take
+        self.check_budget = check_budget
         self.load_services()
     
     def load_services(self):
         """Load services from config file"""
+        self._config_mtime = self._read_config_mtime()
         try:
-            if self.config_path.exists():
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
-                    self.services = config.get('services', [])
-                    print(f"Loaded {len(self.services)} services from config")
+            if self._config_mtime is not None:
+                config = orjson.loads(self.config_path.read_bytes())
+                self.services = config.get('services', [])
+                print(f"Loaded {len(self.services)} services from config")
             else:
                 print(f"Config file not found: {self.config_path}")
                 self.services = []
         except Exception as e:
             print(f"Error loading services config: {e}")
             self.services = []
-    
-    async def check_service_health(self, service: Dict) -> Dict:
-        """Check health of a single service"""
-        name = service.get('name', 'Unknown')
+
+        self._prepared = [
+            self._prepare_service(service) for service in self.services
+            if service.get('enabled', True)
+        ]
+
+        # Forget results for services that are no longer configured
+        names = {service.name for service in self._prepared}
+        self.health_status = {
+            name: status for name, status in self.health_status.items() if name in names
+        }
+
+    def _read_config_mtime(self) -> Optional[int]:
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def reload_if_changed(self):
+        """Reload the config only if the file was modified, created or removed since the last load"""
+        if self._read_config_mtime() != self._config_mtime:
+            self.load_services()
+
+    @staticmethod
+    def _prepare_service(service: Dict) -> PreparedService:
+        """Resolve defaults and the health URL for one config entry"""
         url = service.get('url', '')
         health_endpoint = service.get('health_endpoint', '/health')
-        
-        # Build full health URL
-        full_url = f"{url.rstrip('/')}{health_endpoint}"
-        
-        result = {
-            'name': name,
-            'url': url,
-            'health_endpoint': health_endpoint,
+        return PreparedService(
+            name=service.get('name', 'Unknown'),
+            url=url,
+            health_endpoint=health_endpoint,
+            # Build full health URL
+            full_url=f"{url.rstrip('/')}{health_endpoint}",
+        )
+    
+    @staticmethod
+    def _new_result(service: PreparedService) -> Dict:
+        return {
+            'name': service.name,
+            'url': service.url,
+            'health_endpoint': service.health_endpoint,
             'status': 'unknown',
             'response_time_ms': None,
             'last_check': datetime.now().isoformat(),
             'error': None
         }
+
+    async def check_service_health(self, service: PreparedService) -> Dict:
+        """Check health of a single service"""
+        result = self._new_result(service)
         
         try:
-            start_time = asyncio.get_event_loop().time()
-            
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(full_url)
-                
-                end_time = asyncio.get_event_loop().time()
-                response_time = (end_time - start_time) * 1000  # Convert to ms
-                
-                result['response_time_ms'] = round(response_time, 2)
-                
-                # Consider 2xx status codes as healthy
-                if 200 <= response.status_code < 300:
-                    result['status'] = 'healthy'
-                else:
-                    result['status'] = 'unhealthy'
-                    result['error'] = f"HTTP {response.status_code}"
-                    
+            async with self.semaphore:
+                start_time = time.monotonic()
+                response = await self.client.get(service.full_url)
+                end_time = time.monotonic()
+
+            response_time = (end_time - start_time) * 1000  # Convert to ms
+
+            result['response_time_ms'] = round(response_time, 2)
+
+            # Consider 2xx status codes as healthy
+            if 200 <= response.status_code < 300:
+                result['status'] = 'healthy'
+            else:
+                result['status'] = 'unhealthy'
+                result['error'] = f"HTTP {response.status_code}"
+
         except httpx.TimeoutException:
             result['status'] = 'unhealthy'
             result['error'] = 'Timeout'
@@ -81,19 +133,45 @@ class ServiceHealthChecker:
     
     async def check_all_services(self):
         """Check health of all enabled services"""
-        enabled_services = [s for s in self.services if s.get('enabled', True)]
-        
-        if not enabled_services:
+        self.reload_if_changed()
+        if not self._prepared:
             return
+
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                timeout=5.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
         
-        # Check all services concurrently
-        tasks = [self.check_service_health(service) for service in enabled_services]
-        results = await asyncio.gather(*tasks)
+        # Check all services concurrently, giving up on any still running once the budget is spent
+        tasks = {
+            asyncio.create_task(self.check_service_health(service)): service
+            for service in self._prepared
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.check_budget)
+        for task in pending:
+            task.cancel()
         
-        # Update health status
-        for result in results:
+        # Update health status, in config order
+        for task, service in tasks.items():
+            if task in done:
+                result = task.result()
+            else:
+                result = self._new_result(service)
+                result['error'] = 'Check did not finish in time'
             self.health_status[result['name']] = result
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
     
+    async def aclose(self):
+        """Close the pooled HTTP client; the next check cycle opens a new one"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+            self.semaphore = None
+
     def get_all_health_status(self) -> List[Dict]:
         """Get health status of all services"""
         return list(self.health_status.values())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Check that databases created by older schemas migrate without losing data"""
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+
+import database
+
+TIMESTAMP = time.time() - 60
+
+CPU = {'percent': 42.3, 'per_cpu': [10.1, 20.2], 'count': 4,
+       'frequency': {'current': 1500.0, 'min': 600.0, 'max': 1800.0}}
+MEMORY = {'total': 100, 'available': 40, 'used': 60, 'percent': 55.5,
+          'swap': {'total': 10, 'used': 1, 'percent': 1.2}}
+TEMPERATURE = {'cpu': 50.5}
+
+# Original schema: every metric stored as JSON in one table with a rowid
+BASELINE_SCHEMA = """
+    CREATE TABLE metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        metric_type TEXT NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE TABLE docker_metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        container_id TEXT,
+        container_name TEXT,
+        data TEXT NOT NULL
+    );
+"""
+
+# Typed tables with a rowid, percent columns stored as REAL and no IO rate columns
+TYPED_REAL_SCHEMA = BASELINE_SCHEMA + """
+    CREATE TABLE cpu_metrics (
+        timestamp REAL PRIMARY KEY, percent REAL, per_cpu TEXT, count INTEGER,
+        frequency_current REAL, frequency_min REAL, frequency_max REAL
+    );
+    CREATE TABLE memory_metrics (
+        timestamp REAL PRIMARY KEY, total INTEGER, available INTEGER, used INTEGER,
+        percent REAL, swap_total INTEGER, swap_used INTEGER, swap_percent REAL
+    );
+    CREATE TABLE disk_metrics (
+        timestamp REAL PRIMARY KEY, total INTEGER, used INTEGER, free INTEGER, percent REAL,
+        io_read_bytes INTEGER, io_write_bytes INTEGER, io_read_count INTEGER, io_write_count INTEGER
+    );
+    CREATE TABLE network_metrics (
+        timestamp REAL PRIMARY KEY, bytes_sent INTEGER, bytes_recv INTEGER,
+        packets_sent INTEGER, packets_recv INTEGER, errin INTEGER, errout INTEGER,
+        dropin INTEGER, dropout INTEGER
+    );
+"""
+
+
+def migrate_and_read(schema: str, rows: str, params) -> dict:
+    """Build an old-schema database, run init_database() twice and read every metric back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "metrics.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(schema)
+        conn.executemany(rows, params)
+        conn.commit()
+        conn.close()
+
+        original_path = database.DB_PATH
+        database.DB_PATH = db_path
+        try:
+            database.init_database()
+            database.init_database()  # Migrations must be idempotent
+            return {
+                metric_type: orjson.loads(orjson.dumps(database.get_metrics_range(metric_type, 0)))
+                for metric_type in ('cpu', 'memory', 'temperature')
+            }
+        finally:
+            database.close_database()
+            database.DB_PATH = original_path
+
+
+def check(result: dict):
+    for metric_type, expected in (('cpu', CPU), ('memory', MEMORY), ('temperature', TEMPERATURE)):
+        rows = result[metric_type]
+        assert len(rows) == 1, (metric_type, rows)
+        assert rows[0]['timestamp'] == TIMESTAMP, (metric_type, rows)
+        assert rows[0]['data'] == expected, (metric_type, rows[0]['data'], expected)
+
+
+def test_baseline_schema():
+    check(migrate_and_read(
+        BASELINE_SCHEMA,
+        "INSERT INTO metrics (timestamp, metric_type, data) VALUES (?, ?, ?)",
+        [(TIMESTAMP, 'cpu', orjson.dumps(CPU)),
+         (TIMESTAMP, 'memory', orjson.dumps(MEMORY)),
+         (TIMESTAMP, 'temperature', orjson.dumps(TEMPERATURE))],
+    ))
+
+
+def test_typed_real_percent_schema():
+    check(migrate_and_read(
+        TYPED_REAL_SCHEMA + f"""
+            INSERT INTO cpu_metrics VALUES ({TIMESTAMP!r}, 42.3, '[10.1,20.2]', 4, 1500.0, 600.0, 1800.0);
+            INSERT INTO memory_metrics VALUES ({TIMESTAMP!r}, 100, 40, 60, 55.5, 10, 1, 1.2);
+        """,
+        "INSERT INTO metrics (timestamp, metric_type, data) VALUES (?, ?, ?)",
+        [(TIMESTAMP, 'temperature', orjson.dumps(TEMPERATURE))],
+    ))
+
+
+if __name__ == "__main__":
+    test_baseline_schema()
+    print("Baseline schema: ok")
+    test_typed_real_percent_schema()
+    print("Typed tables with REAL percent columns: ok")
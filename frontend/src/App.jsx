@@ -180,9 +180,9 @@ function App() {
                       </div>
                     )}
 
-                    {container.state?.Running && (
+                    {container.status === 'running' && container.status_text && (
                       <div className="container-uptime">
-                        Started: {new Date(container.state?.StartedAt).toLocaleString()}
+                        {container.status_text}
                       </div>
                     )}
                   </div>